@@ -20,6 +20,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from extract import HealthcareDataExtractor
 from transform import HealthcareDataTransformer
 from load import HealthcareDataLoader
+from aggregate import HealthcareDataAggregator
 
 # Default arguments for the DAG
 default_args = {
@@ -106,7 +107,30 @@ transform_task = PythonOperator(
     dag=dag,
 )
 
-# Task 4: Load data to database
+# Task 4: Build gold layer aggregates
+def aggregate_healthcare_data(**context):
+    """Build dashboard aggregates from silver layer into gold layer."""
+    aggregator = HealthcareDataAggregator()
+    
+    # Build all gold layer tables
+    data = aggregator.build_gold_layer()
+    
+    # Log aggregation results
+    for table_name, df in data.items():
+        print(f"Aggregated {table_name}: {df.shape[0]} rows, {df.shape[1]} columns")
+    
+    return {
+        'aggregation_status': 'success',
+        'tables_aggregated': list(data.keys())
+    }
+
+aggregate_task = PythonOperator(
+    task_id='aggregate_healthcare_data',
+    python_callable=aggregate_healthcare_data,
+    dag=dag,
+)
+
+# Task 5: Load data to database
 def load_healthcare_data(**context):
     """Load healthcare data to PostgreSQL database."""
     loader = HealthcareDataLoader()
@@ -131,7 +155,7 @@ load_task = PythonOperator(
     dag=dag,
 )
 
-# Task 5: Run data quality checks
+# Task 6: Run data quality checks
 def run_data_quality_checks(**context):
     """Run comprehensive data quality checks."""
     from sqlalchemy import create_engine, text
@@ -229,7 +253,7 @@ quality_check_task = PythonOperator(
     dag=dag,
 )
 
-# Task 6: Generate analytics reports
+# Task 7: Generate analytics reports
 def generate_analytics_reports(**context):
     """Generate analytics reports and insights."""
     from sqlalchemy import create_engine, text
@@ -329,7 +353,7 @@ analytics_task = PythonOperator(
     dag=dag,
 )
 
-# Task 7: Send success notification
+# Task 8: Send success notification
 success_notification = EmailOperator(
     task_id='send_success_notification',
     to=['analytics@healthcare.com'],
@@ -344,7 +368,7 @@ success_notification = EmailOperator(
     dag=dag,
 )
 
-# Task 8: Send failure notification
+# Task 9: Send failure notification
 failure_notification = EmailOperator(
     task_id='send_failure_notification',
     to=['analytics@healthcare.com', 'admin@healthcare.com'],
@@ -366,10 +390,11 @@ failure_notification = EmailOperator(
 
 # Define task dependencies
 extract_task >> transform_task >> load_task >> quality_check_task >> analytics_task
+transform_task >> aggregate_task
 
 # Add notifications
-analytics_task >> success_notification
-[extract_task, transform_task, load_task, quality_check_task, analytics_task] >> failure_notification
+[analytics_task, aggregate_task] >> success_notification
+[extract_task, transform_task, aggregate_task, load_task, quality_check_task, analytics_task] >> failure_notification
 
 # =============================================
 # DAG DOCUMENTATION
@@ -383,9 +408,10 @@ This DAG orchestrates the complete healthcare data processing pipeline:
 ## Pipeline Overview
 1. **Extract**: Pull data from various healthcare data sources
 2. **Transform**: Clean, standardize, and enrich the data
-3. **Load**: Store processed data in PostgreSQL data warehouse
-4. **Quality Check**: Validate data integrity and completeness
-5. **Analytics**: Generate business intelligence reports
+3. **Aggregate**: Pre-compute dashboard aggregates into the gold layer
+4. **Load**: Store processed data in PostgreSQL data warehouse
+5. **Quality Check**: Validate data integrity and completeness
+6. **Analytics**: Generate business intelligence reports
 
 ## Data Sources
 - Healthcare Claims Data
@@ -0,0 +1,327 @@
+"""
+Data aggregation module for healthcare ETL pipeline.
+Pre-computes dashboard aggregates from silver layer into the gold layer.
+"""
+
+import os
+import pandas as pd
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence
+import pyarrow as pa
+import pyarrow.dataset as ds
+from loguru import logger
+
+from utils import (
+    setup_logging, get_data_paths, ensure_directory_exists,
+    log_dataframe_info, save_parquet_with_metadata, generate_etl_metadata
+)
+
+# Gold layer tables consumed by the analytics dashboard
+GOLD_TABLES = [
+    'summary',
+    'claims_kpis',
+    'cost_drivers',
+    'provider_performance',
+    'hospital_performance',
+    'hospital_top10',
+    'monthly_trends',
+    'patient_demographics',
+    'age_category_distribution',
+    'gender_distribution',
+    'readmission_analysis',
+    'readmission_top10',
+    'state_analysis'
+]
+
+# Silver layer tables the gold layer is built from
+GOLD_INPUT_TABLES = ['claims', 'patients', 'providers']
+
+def is_gold_current(gold_files: Sequence[str], silver_path: str) -> bool:
+    """Check whether the gold files exist and are all newer than the silver tables they are built from."""
+    silver_files = [os.path.join(silver_path, f"{table_name}_clean.parquet") for table_name in GOLD_INPUT_TABLES]
+    if not all(os.path.exists(path) for path in list(gold_files) + silver_files):
+        return False
+    return min(map(os.path.getmtime, gold_files)) > max(map(os.path.getmtime, silver_files))
+
+# Compact dtypes for aggregated columns (value ranges are validated in transform);
+# cost stays float64 so dollar totals are exact
+SILVER_DTYPES = {
+    'length_of_stay': pa.int16(),
+    'readmission_flag': pa.int8(),
+    'chronic_conditions': pa.int8()
+}
+
+def _read_silver_table(silver_path: str, table_name: str, columns: List[str],
+                       row_filter: Optional[ds.Expression] = None) -> pa.Table:
+    """Read only the required columns (and matching rows) of a silver layer table as an Arrow table."""
+    dataset = ds.dataset(os.path.join(silver_path, f"{table_name}_clean.parquet"), format="parquet")
+    table = dataset.to_table(columns=columns, filter=row_filter)
+
+    # Downcast wide numeric columns so aggregations scan fewer bytes
+    schema = pa.schema([
+        field.with_type(SILVER_DTYPES.get(field.name, field.type)) for field in table.schema
+    ])
+    return table.cast(schema)
+
+# Claims columns used by the dashboard aggregates
+CLAIMS_COLUMNS = [
+    'claim_id', 'provider_id', 'diagnosis_code', 'cost', 'readmission_flag',
+    'length_of_stay', 'admission_year', 'admission_month'
+]
+
+# Rows per claims scan batch, sized so a batch of the projected columns stays in L2 cache
+CLAIMS_BATCH_SIZE = 8192
+
+# Pending per-batch partials per grouping before they are folded into one table
+CLAIMS_PARTIALS_FOLD = 64
+
+# Claims groupings aggregated batch by batch
+CLAIMS_GROUPINGS = {
+    'diagnosis': ['diagnosis_code'],
+    'provider': ['provider_id'],
+    'month': ['admission_year', 'admission_month']
+}
+
+# Per-batch partial aggregates; each one combines across batches by summing
+CLAIMS_PARTIALS = [
+    ('claim_id', 'count'),
+    ('cost', 'sum'),
+    ('cost', 'count'),
+    ('readmission_flag', 'sum'),
+    ('readmission_flag', 'count'),
+    ('length_of_stay', 'sum'),
+    ('length_of_stay', 'count')
+]
+
+def _aggregate_claims(silver_path: str, row_filter: Optional[ds.Expression] = None) -> Dict[str, pd.DataFrame]:
+    """Aggregate claims per grouping, one scan batch at a time.
+
+    Per-batch partial sums and counts are folded into a single running table
+    every CLAIMS_PARTIALS_FOLD batches, so memory stays bounded by one batch
+    plus at most that many partial tables per grouping. The result has one
+    row per group, with columns named ``<column>_sum`` / ``<column>_count``.
+    """
+    dataset = ds.dataset(os.path.join(silver_path, "claims_clean.parquet"), format="parquet")
+    schema = pa.schema([
+        dataset.schema.field(column).with_type(
+            SILVER_DTYPES.get(column, dataset.schema.field(column).type)
+        ) for column in CLAIMS_COLUMNS
+    ])
+
+    partial_columns = [f"{column}_{aggregation}" for column, aggregation in CLAIMS_PARTIALS]
+
+    def fold(tables: List[pa.Table], keys: List[str]) -> pa.Table:
+        """Sum partial tables into one row per group, keeping the partial column names."""
+        return pa.concat_tables(tables).group_by(keys).aggregate([
+            (column, 'sum') for column in partial_columns
+        ]).select(
+            keys + [f"{column}_sum" for column in partial_columns]
+        ).rename_columns(keys + partial_columns)
+
+    def aggregate_batch(table: pa.Table) -> None:
+        for name, keys in CLAIMS_GROUPINGS.items():
+            partials[name].append(
+                table.group_by(keys).aggregate(CLAIMS_PARTIALS).select(keys + partial_columns)
+            )
+            if len(partials[name]) >= CLAIMS_PARTIALS_FOLD:
+                partials[name] = [fold(partials[name], keys)]
+
+    # Seed with an empty table so every grouping has a schema even when the filter matches no rows
+    partials = {name: [] for name in CLAIMS_GROUPINGS}
+    aggregate_batch(schema.empty_table())
+    for batch in dataset.to_batches(columns=CLAIMS_COLUMNS, filter=row_filter, batch_size=CLAIMS_BATCH_SIZE):
+        aggregate_batch(pa.Table.from_batches([batch]).cast(schema))
+
+    return {name: fold(partials[name], keys).to_pandas() for name, keys in CLAIMS_GROUPINGS.items()}
+
+def _mean(total: float, count: int) -> Optional[float]:
+    """Mean from a combined sum and count, or None when there were no values."""
+    return total / count if count else None
+
+def build_dashboard_aggregates(silver_path: str, states: Optional[Sequence[str]] = None,
+                               start_date: Optional[date] = None,
+                               end_date: Optional[date] = None) -> Dict[str, pd.DataFrame]:
+    """Build the dashboard aggregates from silver layer files.
+
+    Optional state and admission date filters are pushed down into the
+    parquet scan, so row groups outside the filter are never decoded.
+    """
+    provider_filter = ds.field('state').isin(list(states)) if states else None
+    providers_df = _read_silver_table(silver_path, 'providers', [
+        'provider_id', 'hospital_name', 'state'
+    ], provider_filter).to_pandas()
+
+    claims_filter = None
+    if states:
+        claims_filter = ds.field('provider_id').isin(providers_df['provider_id'].tolist())
+    if start_date:
+        start_filter = ds.field('admission_date') >= pa.scalar(pd.Timestamp(start_date))
+        claims_filter = start_filter if claims_filter is None else claims_filter & start_filter
+    if end_date:
+        end_filter = ds.field('admission_date') < pa.scalar(pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        claims_filter = end_filter if claims_filter is None else claims_filter & end_filter
+    claims_aggregates = _aggregate_claims(silver_path, claims_filter)
+
+    patients_df = _read_silver_table(silver_path, 'patients', [
+        'patient_id', 'age_category', 'gender', 'insurance_type', 'chronic_conditions'
+    ]).to_pandas()
+
+    # Overall claim totals, summed from the per-diagnosis aggregates
+    totals = claims_aggregates['diagnosis'].drop(columns='diagnosis_code').sum()
+    total_claims = int(totals['claim_id_count'])
+    total_cost = float(totals['cost_sum'])
+
+    # Create summary statistics
+    summary_data = [
+        {'metric': 'Total Patients', 'value': str(len(patients_df))},
+        {'metric': 'Total Claims', 'value': str(total_claims)},
+        {'metric': 'Total Providers', 'value': str(len(providers_df))},
+        {'metric': 'Total Cost', 'value': f'${total_cost:,.2f}'}
+    ]
+    summary_df = pd.DataFrame(summary_data)
+
+    # Numeric KPIs for dashboards that format their own metric cards
+    claims_kpis = pd.DataFrame([{
+        'total_patients': len(patients_df),
+        'total_claims': total_claims,
+        'total_providers': len(providers_df),
+        'total_cost': total_cost,
+        'avg_cost_per_claim': _mean(totals['cost_sum'], totals['cost_count']),
+        'avg_length_of_stay': _mean(totals['length_of_stay_sum'], totals['length_of_stay_count']),
+        'total_readmissions': int(totals['readmission_flag_sum']),
+        'readmission_rate': _mean(totals['readmission_flag_sum'], totals['readmission_flag_count'])
+    }])
+
+    # Top cost drivers
+    cost_drivers = claims_aggregates['diagnosis']
+    cost_drivers = pd.DataFrame({
+        'diagnosis_code': cost_drivers['diagnosis_code'],
+        'total_cost': cost_drivers['cost_sum'],
+        'avg_cost_per_claim': cost_drivers['cost_sum'] / cost_drivers['cost_count'],
+        'claim_count': cost_drivers['cost_count'],
+        'readmission_rate': cost_drivers['readmission_flag_sum'] / cost_drivers['readmission_flag_count']
+    })
+    cost_drivers = cost_drivers.sort_values('total_cost', ascending=False).head(10).round(2)
+    cost_drivers['description'] = 'Sample Diagnosis'
+
+    # Hospital performance (unrounded per-provider aggregates, then the rounded top 15)
+    provider_perf = claims_aggregates['provider']
+    provider_perf = pd.DataFrame({
+        'provider_id': provider_perf['provider_id'],
+        'total_revenue': provider_perf['cost_sum'],
+        'avg_cost_per_claim': provider_perf['cost_sum'] / provider_perf['cost_count'],
+        'total_claims': provider_perf['claim_id_count'],
+        'readmission_rate_pct': provider_perf['readmission_flag_sum'] / provider_perf['readmission_flag_count']
+    })
+    provider_perf = provider_perf.merge(providers_df, on='provider_id')
+    hospital_perf = provider_perf.sort_values('total_revenue', ascending=False).head(15).round(2)
+
+    # State-level analysis
+    state_analysis = hospital_perf.groupby('state').agg({
+        'total_revenue': 'sum',
+        'total_claims': 'sum',
+        'readmission_rate_pct': 'mean'
+    }).reset_index()
+
+    # Monthly trends
+    monthly_trends = claims_aggregates['month']
+    monthly_trends = pd.DataFrame({
+        'admission_year': monthly_trends['admission_year'],
+        'admission_month': monthly_trends['admission_month'],
+        'claim_count': monthly_trends['claim_id_count'],
+        'total_cost': monthly_trends['cost_sum'],
+        'avg_cost_per_claim': monthly_trends['cost_sum'] / monthly_trends['cost_count'],
+        'avg_length_of_stay': monthly_trends['length_of_stay_sum'] / monthly_trends['length_of_stay_count']
+    }).round(2)
+    monthly_trends = monthly_trends.sort_values(['admission_year', 'admission_month']).reset_index(drop=True)
+
+    # Patient demographics
+    patient_demo = patients_df.groupby(['age_category', 'gender', 'insurance_type']).agg({
+        'patient_id': 'count',
+        'chronic_conditions': 'mean'
+    }).round(2)
+    patient_demo.columns = ['patient_count', 'avg_chronic_conditions']
+    patient_demo = patient_demo.reset_index()
+
+    # Patient distributions
+    age_category_distribution = patients_df['age_category'].value_counts().rename_axis('age_category').reset_index(name='count')
+    gender_distribution = patients_df['gender'].value_counts().rename_axis('gender').reset_index(name='count')
+
+    # Readmission analysis
+    readmission_analysis = hospital_perf.copy()
+    readmission_analysis['readmissions'] = (readmission_analysis['total_claims'] * readmission_analysis['readmission_rate_pct']).round(0)
+    readmission_analysis = readmission_analysis[readmission_analysis['total_claims'] >= 10]
+    readmission_analysis = readmission_analysis.sort_values('readmission_rate_pct', ascending=False).head(15)
+
+    return {
+        'summary': summary_df,
+        'claims_kpis': claims_kpis,
+        'cost_drivers': cost_drivers,
+        'provider_performance': provider_perf,
+        'hospital_performance': hospital_perf,
+        'hospital_top10': hospital_perf.head(10),
+        'monthly_trends': monthly_trends,
+        'patient_demographics': patient_demo,
+        'age_category_distribution': age_category_distribution,
+        'gender_distribution': gender_distribution,
+        'readmission_analysis': readmission_analysis,
+        'readmission_top10': readmission_analysis.head(10),
+        'state_analysis': state_analysis
+    }
+
+class HealthcareDataAggregator:
+    """Aggregate healthcare data from silver to gold layer."""
+
+    def __init__(self):
+        setup_logging()
+        self.data_paths = get_data_paths()
+        self.silver_path = self.data_paths["silver"]
+        self.gold_path = self.data_paths["gold"]
+        ensure_directory_exists(self.gold_path)
+
+    def is_gold_layer_current(self) -> bool:
+        """Check whether every gold table is newer than the silver tables it is built from."""
+        gold_files = [os.path.join(self.gold_path, f"{table_name}.parquet") for table_name in GOLD_TABLES]
+        return is_gold_current(gold_files, self.silver_path)
+
+    def build_gold_layer(self, force: bool = False) -> Dict[str, pd.DataFrame]:
+        """Build dashboard aggregates from silver layer and save to gold layer."""
+        if not force and self.is_gold_layer_current():
+            logger.info("Gold layer is up to date with the silver layer, skipping aggregation")
+            return {
+                table_name: pd.read_parquet(os.path.join(self.gold_path, f"{table_name}.parquet"))
+                for table_name in GOLD_TABLES
+            }
+
+        logger.info("Starting gold layer aggregation...")
+
+        results = build_dashboard_aggregates(self.silver_path)
+
+        # Save aggregates to gold layer
+        output_metadata = generate_etl_metadata()
+        output_metadata.update({
+            "aggregation_timestamp": datetime.now().isoformat(),
+            "pipeline_stage": "gold"
+        })
+
+        for table_name, df in results.items():
+            output_path = os.path.join(self.gold_path, f"{table_name}.parquet")
+            save_parquet_with_metadata(df, output_path, output_metadata)
+            log_dataframe_info(df, "aggregate", table_name)
+
+        logger.info("Gold layer aggregation completed successfully")
+        return results
+
+def main():
+    """Main function to run gold layer aggregation."""
+    aggregator = HealthcareDataAggregator()
+
+    # Build all aggregates
+    data = aggregator.build_gold_layer()
+
+    print(f"Aggregation completed. Data saved to gold layer:")
+    for table_name, df in data.items():
+        print(f"  {table_name}: {df.shape[0]} rows, {df.shape[1]} columns")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Loads transformed data from silver layer into PostgreSQL database.
 """
 
 import os
+import csv
+import io
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -16,6 +18,21 @@ from utils import (
     log_dataframe_info, load_parquet_with_metadata, generate_etl_metadata
 )
 
+def psql_insert_copy(table, conn, keys, data_iter):
+    """Bulk insert rows with PostgreSQL COPY (used as the to_sql method)."""
+    # Serialize rows to an in-memory CSV buffer
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(data_iter)
+    buffer.seek(0)
+    
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'{table.schema}.{table.name}' if table.schema else table.name
+    
+    dbapi_conn = conn.connection
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(f'COPY {table_name} ({columns}) FROM STDIN WITH CSV', buffer)
+
 class HealthcareDataLoader:
     """Load healthcare data from silver layer to PostgreSQL database."""
     
@@ -77,7 +94,7 @@ class HealthcareDataLoader:
             df = self._prepare_patients_for_db(df)
             
             # Load to database
-            df.to_sql('patients', self.engine, if_exists='replace', index=False, method='multi')
+            df.to_sql('patients', self.engine, if_exists='replace', index=False, method=psql_insert_copy)
             
             # Verify loading
             with self.engine.connect() as conn:
@@ -104,7 +121,7 @@ class HealthcareDataLoader:
             df = self._prepare_providers_for_db(df)
             
             # Load to database
-            df.to_sql('providers', self.engine, if_exists='replace', index=False, method='multi')
+            df.to_sql('providers', self.engine, if_exists='replace', index=False, method=psql_insert_copy)
             
             # Verify loading
             with self.engine.connect() as conn:
@@ -130,12 +147,8 @@ class HealthcareDataLoader:
             # Prepare data for loading
             df = self._prepare_claims_for_db(df)
             
-            # Load to database in chunks to handle large datasets
-            chunk_size = 1000
-            for i in range(0, len(df), chunk_size):
-                chunk = df.iloc[i:i+chunk_size]
-                if_exists = 'replace' if i == 0 else 'append'
-                chunk.to_sql('claims', self.engine, if_exists=if_exists, index=False, method='multi')
+            # Load to database with a single COPY stream
+            df.to_sql('claims', self.engine, if_exists='replace', index=False, method=psql_insert_copy)
             
             # Verify loading
             with self.engine.connect() as conn:
@@ -161,12 +174,8 @@ class HealthcareDataLoader:
             # Prepare data for loading
             df = self._prepare_prescriptions_for_db(df)
             
-            # Load to database in chunks
-            chunk_size = 1000
-            for i in range(0, len(df), chunk_size):
-                chunk = df.iloc[i:i+chunk_size]
-                if_exists = 'replace' if i == 0 else 'append'
-                chunk.to_sql('prescriptions', self.engine, if_exists=if_exists, index=False, method='multi')
+            # Load to database with a single COPY stream
+            df.to_sql('prescriptions', self.engine, if_exists='replace', index=False, method=psql_insert_copy)
             
             # Verify loading
             with self.engine.connect() as conn:
@@ -339,6 +348,24 @@ class HealthcareDataLoader:
             logger.error(f"Failed to update provider metrics: {e}")
             return False
     
+    def cluster_claims_table(self) -> bool:
+        """Physically order claims by admission date for range and trend scans."""
+        logger.info("Clustering claims table by admission date...")
+        
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_claims_admission_date ON claims(admission_date)"))
+                conn.execute(text("CLUSTER claims USING idx_claims_admission_date"))
+                conn.execute(text("ANALYZE claims"))
+                conn.commit()
+                
+                logger.info("Claims table clustered successfully")
+                return True
+                
+        except Exception as e:
+            logger.error(f"Failed to cluster claims table: {e}")
+            return False
+    
     def create_analytics_views(self) -> bool:
         """Create analytics views for business intelligence."""
         logger.info("Creating analytics views...")
@@ -383,6 +410,7 @@ class HealthcareDataLoader:
         
         # Update derived metrics
         if success:
+            self.cluster_claims_table()
             self.update_provider_metrics()
             self.create_analytics_views()
         
@@ -302,6 +302,9 @@ class HealthcareDataTransformer:
         # Add day of week
         df['admission_dow'] = df['admission_date'].dt.day_name()
         
+        # Store bounded numeric columns in compact dtypes
+        df = df.astype({'length_of_stay': 'int16', 'readmission_flag': 'int8'})
+        
         logger.info("Claims features engineered successfully")
         return df
     
@@ -0,0 +1,65 @@
+"""
+Shared sample data loader for the simplified Streamlit apps.
+Reads the silver layer once per process and shares it across apps and sessions.
+"""
+
+import glob
+import os
+
+import streamlit as st
+import pyarrow.parquet as pq
+
+# Columns used by the simplified chatbot and dashboard
+SILVER_COLUMNS = {
+    'claims': [
+        'claim_id', 'provider_id', 'diagnosis_code', 'cost', 'readmission_flag',
+        'length_of_stay', 'admission_year', 'admission_month'
+    ],
+    'patients': ['patient_id', 'age', 'gender', 'age_category', 'insurance_type', 'chronic_conditions'],
+    'providers': ['provider_id', 'hospital_name', 'state'],
+    'prescriptions': ['medication_name', 'days_supplied', 'days_prescribed']
+}
+
+# Group key columns, stored as categoricals so groupby/value_counts hash integer codes
+CATEGORY_COLUMNS = {
+    'claims': ['diagnosis_code', 'provider_id'],
+    'patients': ['gender', 'age_category', 'insurance_type'],
+    'providers': ['state'],
+    'prescriptions': ['medication_name']
+}
+
+# Compact numeric dtypes per table, the pandas counterpart of aggregate.SILVER_DTYPES
+NUMERIC_DTYPES = {
+    'claims': {'length_of_stay': 'int16', 'readmission_flag': 'int8'},
+    'patients': {'age': 'int16', 'chronic_conditions': 'int8'},
+    'providers': {},
+    'prescriptions': {'days_supplied': 'int16', 'days_prescribed': 'int16'}
+}
+
+def get_data_version(table_names=tuple(SILVER_COLUMNS), include_gold=False):
+    """Latest modification time of the given silver tables, and optionally of the gold layer files.
+
+    Cached loaders take it as an argument, so they are invalidated whenever the data they read is rewritten.
+    """
+    paths = [f'data/silver/{table_name}_clean.parquet' for table_name in table_names]
+    if include_gold:
+        paths += glob.glob('data/gold/*.parquet')
+    return max((os.path.getmtime(path) for path in paths if os.path.exists(path)), default=0)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_data(data_version):
+    """Load the projected silver tables as DataFrames.
+
+    The returned frames are shared by every session, so callers must not modify them.
+    """
+    data = {}
+    for table_name, columns in SILVER_COLUMNS.items():
+        df = pq.read_table(
+            f'data/silver/{table_name}_clean.parquet', columns=columns, use_threads=True, pre_buffer=True
+        ).to_pandas(self_destruct=True, split_blocks=True)
+        df = df.astype({
+            **NUMERIC_DTYPES[table_name],
+            **{column: 'category' for column in CATEGORY_COLUMNS[table_name]}
+        })
+        data[table_name] = df
+    return data
@@ -12,11 +12,13 @@ import numpy as np
 from datetime import datetime, timedelta
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from utils import get_database_connection
+from utils import get_database_connection, get_data_paths
+from aggregate import GOLD_TABLES, build_dashboard_aggregates, is_gold_current
 from sqlalchemy import create_engine, text
 
 # Page configuration
@@ -49,200 +51,163 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 @st.cache_data
-def load_data_from_files():
+def read_gold_layer(gold_version):
+    """Read every gold layer table (gold_version, the newest gold file mtime, keys the cache to the current build)."""
+    gold_path = get_data_paths()['gold']
+    return {name: pd.read_parquet(os.path.join(gold_path, f'{name}.parquet')) for name in GOLD_TABLES}
+
+def load_data_from_gold():
+    """Load pre-computed aggregates from gold layer files, or None if they are missing or stale."""
+    data_paths = get_data_paths()
+    gold_files = [os.path.join(data_paths['gold'], f'{name}.parquet') for name in GOLD_TABLES]
+    
+    # Gold layer is built by the ETL pipeline (src/aggregate.py), only use it while it is newer than silver
+    if not is_gold_current(gold_files, data_paths['silver']):
+        return None
+    
+    try:
+        return read_gold_layer(max(map(os.path.getmtime, gold_files)))
+    except Exception as e:
+        st.warning(f"Error loading gold layer: {e}")
+        return None
+
+@st.cache_data
+def load_data_from_files(states=None, start_date=None, end_date=None):
     """Load data from parquet files (fallback when database is not available)."""
     try:
-        # Load data from silver layer files
-        claims_df = pd.read_parquet('data/silver/claims_clean.parquet')
-        patients_df = pd.read_parquet('data/silver/patients_clean.parquet')
-        providers_df = pd.read_parquet('data/silver/providers_clean.parquet')
-        prescriptions_df = pd.read_parquet('data/silver/prescriptions_clean.parquet')
-        
-        # Create summary statistics
-        summary_data = [
-            {'metric': 'Total Patients', 'value': str(len(patients_df))},
-            {'metric': 'Total Claims', 'value': str(len(claims_df))},
-            {'metric': 'Total Providers', 'value': str(len(providers_df))},
-            {'metric': 'Total Cost', 'value': f'${claims_df["cost"].sum():,.2f}'}
-        ]
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Top cost drivers
-        cost_drivers = claims_df.groupby('diagnosis_code').agg({
-            'cost': ['sum', 'mean', 'count'],
-            'readmission_flag': 'mean'
-        }).round(2)
-        cost_drivers.columns = ['total_cost', 'avg_cost_per_claim', 'claim_count', 'readmission_rate']
-        cost_drivers = cost_drivers.reset_index()
-        cost_drivers['description'] = 'Sample Diagnosis'
-        cost_drivers = cost_drivers.sort_values('total_cost', ascending=False).head(10)
-        
-        # Hospital performance
-        hospital_perf = claims_df.groupby('provider_id').agg({
-            'cost': ['sum', 'mean'],
-            'claim_id': 'count',
-            'readmission_flag': 'mean'
-        }).round(2)
-        hospital_perf.columns = ['total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct']
-        hospital_perf = hospital_perf.reset_index()
-        hospital_perf = hospital_perf.merge(providers_df[['provider_id', 'hospital_name', 'state']], on='provider_id')
-        hospital_perf = hospital_perf.sort_values('total_revenue', ascending=False).head(15)
-        
-        # Monthly trends
-        claims_df_copy = claims_df.copy()
-        claims_df_copy['admission_date'] = pd.to_datetime(claims_df_copy['admission_date'])
-        monthly_trends = claims_df_copy.groupby([
-            claims_df_copy['admission_date'].dt.year,
-            claims_df_copy['admission_date'].dt.month
-        ]).agg({
-            'claim_id': 'count',
-            'cost': ['sum', 'mean'],
-            'length_of_stay': 'mean'
-        }).round(2)
-        monthly_trends.columns = ['claim_count', 'total_cost', 'avg_cost_per_claim', 'avg_length_of_stay']
-        monthly_trends = monthly_trends.reset_index()
-        monthly_trends.columns = ['admission_year', 'admission_month', 'claim_count', 'total_cost', 'avg_cost_per_claim', 'avg_length_of_stay']
-        
-        # Patient demographics
-        patient_demo = patients_df.groupby(['age_category', 'gender', 'insurance_type']).agg({
-            'patient_id': 'count',
-            'chronic_conditions': 'mean'
-        }).round(2)
-        patient_demo.columns = ['patient_count', 'avg_chronic_conditions']
-        patient_demo = patient_demo.reset_index()
-        
-        # Readmission analysis
-        readmission_analysis = hospital_perf.copy()
-        readmission_analysis['readmissions'] = (readmission_analysis['total_claims'] * readmission_analysis['readmission_rate_pct']).round(0)
-        readmission_analysis = readmission_analysis[readmission_analysis['total_claims'] >= 10]
-        readmission_analysis = readmission_analysis.sort_values('readmission_rate_pct', ascending=False).head(15)
-        
-        return {
-            'summary': summary_df,
-            'cost_drivers': cost_drivers,
-            'hospital_performance': hospital_perf,
-            'monthly_trends': monthly_trends,
-            'patient_demographics': patient_demo,
-            'readmission_analysis': readmission_analysis
-        }
+        # Aggregate directly from silver layer files, filters are pushed into the scan
+        return build_dashboard_aggregates(get_data_paths()['silver'], states, start_date, end_date)
         
     except Exception as e:
         st.error(f"Error loading data from files: {e}")
         return None
 
+# Dashboard aggregates, keyed by the name used in the data dict
+DB_QUERIES = {
+    # Summary statistics
+    'summary': """
+        SELECT 
+            'Total Patients' as metric,
+            COUNT(DISTINCT patient_id)::text as value
+        FROM healthcare.patients
+        UNION ALL
+        SELECT 
+            'Total Claims' as metric,
+            COUNT(claim_id)::text as value
+        FROM healthcare.claims
+        UNION ALL
+        SELECT 
+            'Total Providers' as metric,
+            COUNT(DISTINCT provider_id)::text as value
+        FROM healthcare.providers
+        UNION ALL
+        SELECT 
+            'Total Cost' as metric,
+            '$' || ROUND(SUM(cost), 2)::text as value
+        FROM healthcare.claims
+    """,
+    # Top cost drivers
+    'cost_drivers': """
+        SELECT 
+            diagnosis_code,
+            description,
+            total_cost,
+            claim_count,
+            avg_cost_per_claim,
+            readmission_rate
+        FROM healthcare.diagnosis_cost_analysis
+        LIMIT 10
+    """,
+    # Hospital performance
+    'hospital_performance': """
+        SELECT 
+            hospital_name,
+            state,
+            total_claims,
+            total_revenue,
+            avg_cost_per_claim,
+            readmission_rate_pct
+        FROM healthcare.provider_performance
+        ORDER BY total_revenue DESC
+        LIMIT 15
+    """,
+    # State-level analysis (over the same top hospitals)
+    'state_analysis': """
+        SELECT 
+            state,
+            SUM(total_revenue) as total_revenue,
+            SUM(total_claims) as total_claims,
+            AVG(readmission_rate_pct) as readmission_rate_pct
+        FROM (
+            SELECT state, total_revenue, total_claims, readmission_rate_pct
+            FROM healthcare.provider_performance
+            ORDER BY total_revenue DESC
+            LIMIT 15
+        ) top_hospitals
+        GROUP BY state
+        ORDER BY state
+    """,
+    # Monthly trends
+    'monthly_trends': """
+        SELECT 
+            admission_year,
+            admission_month,
+            COUNT(claim_id) as claim_count,
+            SUM(cost) as total_cost,
+            AVG(cost) as avg_cost_per_claim,
+            AVG(length_of_stay) as avg_length_of_stay
+        FROM healthcare.claims
+        GROUP BY admission_year, admission_month
+        ORDER BY admission_year, admission_month
+    """,
+    # Patient demographics
+    'patient_demographics': """
+        SELECT 
+            age_category,
+            gender,
+            insurance_type,
+            COUNT(*) as patient_count,
+            AVG(chronic_conditions) as avg_chronic_conditions
+        FROM healthcare.patients
+        GROUP BY age_category, gender, insurance_type
+    """,
+    # Readmission analysis
+    'readmission_analysis': """
+        SELECT 
+            hospital_name,
+            state,
+            total_claims,
+            readmissions,
+            readmission_rate_pct
+        FROM healthcare.provider_performance
+        WHERE total_claims >= 10
+        ORDER BY readmission_rate_pct DESC
+        LIMIT 15
+    """
+}
+
+@st.cache_resource(show_spinner=False)
+def get_db_engine():
+    """Create the pooled database engine once per process, shared by every session and refresh."""
+    return create_engine(get_database_connection(), pool_size=len(DB_QUERIES), max_overflow=0)
+
 @st.cache_data
 def load_data_from_db():
     """Load data from PostgreSQL database."""
     try:
-        connection_string = get_database_connection()
-        engine = create_engine(connection_string)
+        engine = get_db_engine()
         
-        # Load key datasets
-        with engine.connect() as conn:
-            # Summary statistics
-            summary_query = """
-            SELECT 
-                'Total Patients' as metric,
-                COUNT(DISTINCT patient_id)::text as value
-            FROM healthcare.patients
-            UNION ALL
-            SELECT 
-                'Total Claims' as metric,
-                COUNT(claim_id)::text as value
-            FROM healthcare.claims
-            UNION ALL
-            SELECT 
-                'Total Providers' as metric,
-                COUNT(DISTINCT provider_id)::text as value
-            FROM healthcare.providers
-            UNION ALL
-            SELECT 
-                'Total Cost' as metric,
-                '$' || ROUND(SUM(cost), 2)::text as value
-            FROM healthcare.claims
-            """
-            summary_df = pd.read_sql(summary_query, conn)
-            
-            # Top cost drivers
-            cost_drivers_query = """
-            SELECT 
-                diagnosis_code,
-                description,
-                total_cost,
-                claim_count,
-                avg_cost_per_claim,
-                readmission_rate
-            FROM healthcare.diagnosis_cost_analysis
-            LIMIT 10
-            """
-            cost_drivers_df = pd.read_sql(cost_drivers_query, conn)
-            
-            # Hospital performance
-            hospital_perf_query = """
-            SELECT 
-                hospital_name,
-                state,
-                total_claims,
-                total_revenue,
-                avg_cost_per_claim,
-                readmission_rate_pct
-            FROM healthcare.provider_performance
-            ORDER BY total_revenue DESC
-            LIMIT 15
-            """
-            hospital_perf_df = pd.read_sql(hospital_perf_query, conn)
-            
-            # Monthly trends
-            monthly_trends_query = """
-            SELECT 
-                admission_year,
-                admission_month,
-                COUNT(claim_id) as claim_count,
-                SUM(cost) as total_cost,
-                AVG(cost) as avg_cost_per_claim,
-                AVG(length_of_stay) as avg_length_of_stay
-            FROM healthcare.claims
-            GROUP BY admission_year, admission_month
-            ORDER BY admission_year, admission_month
-            """
-            monthly_trends_df = pd.read_sql(monthly_trends_query, conn)
-            
-            # Patient demographics
-            patient_demo_query = """
-            SELECT 
-                age_category,
-                gender,
-                insurance_type,
-                COUNT(*) as patient_count,
-                AVG(chronic_conditions) as avg_chronic_conditions
-            FROM healthcare.patients
-            GROUP BY age_category, gender, insurance_type
-            """
-            patient_demo_df = pd.read_sql(patient_demo_query, conn)
-            
-            # Readmission analysis
-            readmission_query = """
-            SELECT 
-                hospital_name,
-                state,
-                total_claims,
-                readmissions,
-                readmission_rate_pct
-            FROM healthcare.provider_performance
-            WHERE total_claims >= 10
-            ORDER BY readmission_rate_pct DESC
-            LIMIT 15
-            """
-            readmission_df = pd.read_sql(readmission_query, conn)
-            
-            return {
-                'summary': summary_df,
-                'cost_drivers': cost_drivers_df,
-                'hospital_performance': hospital_perf_df,
-                'monthly_trends': monthly_trends_df,
-                'patient_demographics': patient_demo_df,
-                'readmission_analysis': readmission_df
+        # Run the independent queries concurrently, one pooled connection each
+        with ThreadPoolExecutor(max_workers=len(DB_QUERIES)) as executor:
+            futures = {
+                name: executor.submit(pd.read_sql, text(query), engine)
+                for name, query in DB_QUERIES.items()
             }
+            data = {name: future.result() for name, future in futures.items()}
+        
+        data['hospital_top10'] = data['hospital_performance'].head(10)
+        data['readmission_top10'] = data['readmission_analysis'].head(10)
+        return data
             
     except Exception as e:
         st.warning(f"Database connection failed: {e}")
@@ -254,13 +219,14 @@ def create_kpi_cards(data):
     if not data:
         return
     
-    summary = data['summary']
+    # Build the metric lookup once instead of masking the frame per card
+    summary = dict(zip(data['summary']['metric'].tolist(), data['summary']['value'].tolist()))
     
     # Create columns for KPI cards
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        patients = summary[summary['metric'] == 'Total Patients']['value'].iloc[0]
+        patients = summary['Total Patients']
         st.metric(
             label="Total Patients",
             value=patients,
@@ -268,7 +234,7 @@ def create_kpi_cards(data):
         )
     
     with col2:
-        claims = summary[summary['metric'] == 'Total Claims']['value'].iloc[0]
+        claims = summary['Total Claims']
         st.metric(
             label="Total Claims",
             value=claims,
@@ -276,7 +242,7 @@ def create_kpi_cards(data):
         )
     
     with col3:
-        providers = summary[summary['metric'] == 'Total Providers']['value'].iloc[0]
+        providers = summary['Total Providers']
         st.metric(
             label="Total Providers",
             value=providers,
@@ -284,7 +250,7 @@ def create_kpi_cards(data):
         )
     
     with col4:
-        total_cost = summary[summary['metric'] == 'Total Cost']['value'].iloc[0]
+        total_cost = summary['Total Cost']
         st.metric(
             label="Total Healthcare Cost",
             value=total_cost,
@@ -303,7 +269,7 @@ def create_cost_analysis_charts(data):
     
     with col1:
         fig = px.bar(
-            data['cost_drivers'].head(10),
+            data['cost_drivers'],
             x='total_cost',
             y='diagnosis_code',
             orientation='h',
@@ -317,7 +283,7 @@ def create_cost_analysis_charts(data):
     
     with col2:
         fig = px.scatter(
-            data['cost_drivers'].head(10),
+            data['cost_drivers'],
             x='claim_count',
             y='avg_cost_per_claim',
             size='total_cost',
@@ -339,7 +305,7 @@ def create_hospital_performance_charts(data):
     
     with col1:
         fig = px.bar(
-            data['hospital_performance'].head(10),
+            data['hospital_top10'],
             x='total_revenue',
             y='hospital_name',
             orientation='h',
@@ -445,7 +411,7 @@ def create_readmission_analysis_charts(data):
     
     with col1:
         fig = px.bar(
-            data['readmission_analysis'].head(10),
+            data['readmission_top10'],
             x='readmission_rate_pct',
             y='hospital_name',
             orientation='h',
@@ -470,20 +436,9 @@ def create_readmission_analysis_charts(data):
         fig.update_layout(height=500)
         st.plotly_chart(fig, use_container_width=True)
 
-def create_geographic_analysis(data):
-    """Create geographic analysis charts."""
-    if not data or data['hospital_performance'].empty:
-        return
-    
-    st.subheader("🗺️ Geographic Analysis")
-    
-    # State-level analysis
-    state_analysis = data['hospital_performance'].groupby('state').agg({
-        'total_revenue': 'sum',
-        'total_claims': 'sum',
-        'readmission_rate_pct': 'mean'
-    }).reset_index()
-    
+@st.cache_data
+def build_state_choropleth(state_analysis):
+    """Build the state revenue choropleth once per state_analysis snapshot."""
     fig = px.choropleth(
         state_analysis,
         locations='state',
@@ -494,6 +449,16 @@ def create_geographic_analysis(data):
         color_continuous_scale='Blues'
     )
     fig.update_layout(height=500)
+    return fig.to_dict()
+
+def create_geographic_analysis(data):
+    """Create geographic analysis charts."""
+    if not data or data['state_analysis'].empty:
+        return
+    
+    st.subheader("🗺️ Geographic Analysis")
+    
+    fig = go.Figure(build_state_choropleth(data['state_analysis']))
     st.plotly_chart(fig, use_container_width=True)
 
 def main():
@@ -509,7 +474,7 @@ def main():
         st.cache_data.clear()
         st.rerun()
     
-    # Date range selector (placeholder for future enhancement)
+    # Date range selector
     st.sidebar.subheader("Date Range")
     start_date = st.sidebar.date_input("Start Date", value=datetime.now() - timedelta(days=365))
     end_date = st.sidebar.date_input("End Date", value=datetime.now())
@@ -522,9 +487,15 @@ def main():
         default=['CA', 'NY', 'TX', 'FL', 'IL']
     )
     
+    # Filtered views are aggregated from silver files, the default view uses precomputed aggregates
+    apply_filters = st.sidebar.checkbox("Apply date and state filters", value=False)
+    
     # Load data
     with st.spinner("Loading healthcare data..."):
-        data = load_data_from_db()
+        if apply_filters:
+            data = load_data_from_files(tuple(selected_states), start_date, end_date)
+        else:
+            data = load_data_from_gold() or load_data_from_db()
     
     if not data:
         st.error("Failed to load data. Please check your database connection.")
@@ -6,8 +6,11 @@ Works without database connection using sample data.
 import streamlit as st
 import pandas as pd
 import numpy as np
+import re
 from datetime import datetime
 
+from _data import get_data, get_data_version
+
 # Page configuration
 st.set_page_config(
     page_title="Healthcare AI Chatbot",
@@ -23,145 +26,225 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+def group_sum(keys, values):
+    """Sum values per category of a categorical key using np.bincount over its codes."""
+    codes = keys.cat.codes.to_numpy()
+    observed = codes >= 0
+    sums = np.bincount(codes[observed], weights=values[observed], minlength=len(keys.cat.categories))
+    return pd.Series(sums, index=keys.cat.categories)
+
+def group_mean(keys, values):
+    """Mean of values per observed category of a categorical key using np.bincount."""
+    codes = keys.cat.codes.to_numpy()
+    observed = codes >= 0
+    sums = np.bincount(codes[observed], weights=values[observed], minlength=len(keys.cat.categories))
+    counts = np.bincount(codes[observed], minlength=len(keys.cat.categories))
+    present = counts > 0
+    return pd.Series(sums[present] / counts[present], index=keys.cat.categories[present])
+
+def precompute_aggregates(claims_df, patients_df, providers_df, prescriptions_df):
+    """Precompute the aggregates used to answer queries (data is static per session)."""
+    # Top diagnoses by cost and readmission rate (partial sort, only the top k are kept)
+    cost_by_diagnosis = group_sum(claims_df['diagnosis_code'], claims_df['cost'].to_numpy()).nlargest(10)
+    readmission_by_diagnosis = group_mean(claims_df['diagnosis_code'], claims_df['readmission_flag'].to_numpy()).nlargest(5)
+    
+    # Hospital performance
+    hospital_perf = claims_df.groupby('provider_id', sort=False, observed=True, as_index=False).agg(
+        total_revenue=('cost', 'sum'),
+        avg_cost_per_claim=('cost', 'mean'),
+        total_claims=('claim_id', 'count'),
+        readmission_rate_pct=('readmission_flag', 'mean')
+    ).round(2)
+    hospital_perf = hospital_perf.merge(providers_df[['provider_id', 'hospital_name', 'state']], on='provider_id')
+    hospital_perf = hospital_perf.nlargest(10, 'total_revenue').reset_index(drop=True)
+    
+    # Medication adherence
+    adherence_rate = prescriptions_df['days_supplied'].to_numpy() / prescriptions_df['days_prescribed'].to_numpy()
+    np.clip(adherence_rate, 0, 1, out=adherence_rate)
+    med_adherence = group_mean(prescriptions_df['medication_name'], adherence_rate).nlargest(5)
+    
+    # Session-constant scalars, formatted directly by the answers
+    cost = claims_df['cost'].to_numpy()
+    readmission_flag = claims_df['readmission_flag'].to_numpy()
+    
+    return {
+        'cost_by_diagnosis': cost_by_diagnosis,
+        'readmission_by_diagnosis': readmission_by_diagnosis,
+        'hospital_perf': hospital_perf,
+        'top_meds': prescriptions_df['medication_name'].value_counts(sort=False).nlargest(10),
+        'med_adherence': med_adherence,
+        'avg_adherence': float(adherence_rate.mean()),
+        'gender_dist': patients_df['gender'].value_counts(),
+        'age_categories': patients_df['age_category'].value_counts(),
+        'avg_age': float(patients_df['age'].mean()),
+        'total_patients': len(patients_df),
+        'total_claims': len(claims_df),
+        'total_providers': len(providers_df),
+        'total_prescriptions': len(prescriptions_df),
+        'total_cost': float(cost.sum()),
+        'avg_cost': float(cost.mean()),
+        'readmission_rate': float(readmission_flag.mean()),
+        'total_readmissions': int(readmission_flag.sum()),
+        'avg_los': float(claims_df['length_of_stay'].mean())
+    }
+
+@st.cache_data(persist='disk', show_spinner=False, max_entries=1)
+def load_aggregates(data_version):
+    """Precompute query aggregates from the shared sample data."""
+    data = get_data(data_version)
+    return precompute_aggregates(data['claims'], data['patients'], data['providers'], data['prescriptions'])
+
 def load_sample_data():
     """Load sample data for analysis."""
     try:
-        claims_df = pd.read_parquet('data/silver/claims_clean.parquet')
-        patients_df = pd.read_parquet('data/silver/patients_clean.parquet')
-        providers_df = pd.read_parquet('data/silver/providers_clean.parquet')
-        prescriptions_df = pd.read_parquet('data/silver/prescriptions_clean.parquet')
-        
-        return {
-            'claims': claims_df,
-            'patients': patients_df,
-            'providers': providers_df,
-            'prescriptions': prescriptions_df
-        }
+        # Queries only read the aggregates; the silver tables are read on a cache miss
+        return {'aggregates': load_aggregates(get_data_version())}
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
-def analyze_query(query, data):
-    """Analyze user query and provide response."""
-    query_lower = query.lower()
+def answer_cost_query(query_lower, data):
+    """Answer cost analysis queries."""
+    aggregates = data['aggregates']
+    if 'top' in query_lower and 'diagnosis' in query_lower:
+        parts = [f"**Top 10 Most Expensive Diagnosis Codes:**\n\n"]
+        parts.extend(
+            f"{i}. {diagnosis}: ${cost:,.2f}\n"
+            for i, (diagnosis, cost) in enumerate(aggregates['cost_by_diagnosis'].items(), 1)
+        )
+        return ''.join(parts)
     
-    # Cost analysis queries
-    if any(word in query_lower for word in ['cost', 'expensive', 'expensive', 'revenue', 'money']):
-        if 'top' in query_lower and 'diagnosis' in query_lower:
-            cost_by_diagnosis = data['claims'].groupby('diagnosis_code')['cost'].sum().sort_values(ascending=False).head(10)
-            response = f"**Top 10 Most Expensive Diagnosis Codes:**\n\n"
-            for i, (diagnosis, cost) in enumerate(cost_by_diagnosis.items(), 1):
-                response += f"{i}. {diagnosis}: ${cost:,.2f}\n"
-            return response
-        
-        elif 'total' in query_lower:
-            total_cost = data['claims']['cost'].sum()
-            avg_cost = data['claims']['cost'].mean()
-            response = f"**Healthcare Cost Summary:**\n\n"
-            response += f"• Total Cost: ${total_cost:,.2f}\n"
-            response += f"• Average Cost per Claim: ${avg_cost:,.2f}\n"
-            response += f"• Total Claims: {len(data['claims']):,}\n"
-            return response
-    
-    # Readmission analysis queries
-    elif any(word in query_lower for word in ['readmission', 'readmit', 'return']):
-        readmission_rate = data['claims']['readmission_flag'].mean() * 100
-        total_readmissions = data['claims']['readmission_flag'].sum()
-        
-        response = f"**Readmission Analysis:**\n\n"
-        response += f"• Overall Readmission Rate: {readmission_rate:.1f}%\n"
-        response += f"• Total Readmissions: {total_readmissions:,}\n"
-        response += f"• Total Claims: {len(data['claims']):,}\n"
-        
-        # Top readmission diagnoses
-        readmission_by_diagnosis = data['claims'].groupby('diagnosis_code')['readmission_flag'].mean().sort_values(ascending=False).head(5)
-        response += f"\n**Top 5 Diagnosis Codes by Readmission Rate:**\n"
-        for diagnosis, rate in readmission_by_diagnosis.items():
-            response += f"• {diagnosis}: {rate*100:.1f}%\n"
-        
-        return response
+    elif 'total' in query_lower:
+        parts = [
+            f"**Healthcare Cost Summary:**\n\n",
+            f"• Total Cost: ${aggregates['total_cost']:,.2f}\n",
+            f"• Average Cost per Claim: ${aggregates['avg_cost']:,.2f}\n",
+            f"• Total Claims: {aggregates['total_claims']:,}\n"
+        ]
+        return ''.join(parts)
+
+def answer_readmission_query(query_lower, data):
+    """Answer readmission analysis queries."""
+    aggregates = data['aggregates']
+    readmission_rate = aggregates['readmission_rate'] * 100
+    total_readmissions = aggregates['total_readmissions']
     
-    # Patient demographics queries
-    elif any(word in query_lower for word in ['patient', 'demographic', 'age', 'gender']):
-        avg_age = data['patients']['age'].mean()
-        gender_dist = data['patients']['gender'].value_counts()
-        age_categories = data['patients']['age_category'].value_counts()
-        
-        response = f"**Patient Demographics:**\n\n"
-        response += f"• Total Patients: {len(data['patients']):,}\n"
-        response += f"• Average Age: {avg_age:.1f} years\n"
-        response += f"• Gender Distribution:\n"
-        for gender, count in gender_dist.items():
-            response += f"  - {gender}: {count:,} ({count/len(data['patients'])*100:.1f}%)\n"
-        response += f"• Age Categories:\n"
-        for category, count in age_categories.items():
-            response += f"  - {category}: {count:,} ({count/len(data['patients'])*100:.1f}%)\n"
-        
-        return response
-    
-    # Hospital performance queries
-    elif any(word in query_lower for word in ['hospital', 'provider', 'facility']):
-        hospital_perf = data['claims'].groupby('provider_id').agg({
-            'cost': ['sum', 'mean'],
-            'claim_id': 'count',
-            'readmission_flag': 'mean'
-        }).round(2)
-        hospital_perf.columns = ['total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct']
-        hospital_perf = hospital_perf.reset_index()
-        hospital_perf = hospital_perf.merge(data['providers'][['provider_id', 'hospital_name', 'state']], on='provider_id')
-        hospital_perf = hospital_perf.sort_values('total_revenue', ascending=False).head(10)
+    parts = [
+        f"**Readmission Analysis:**\n\n",
+        f"• Overall Readmission Rate: {readmission_rate:.1f}%\n",
+        f"• Total Readmissions: {total_readmissions:,}\n",
+        f"• Total Claims: {aggregates['total_claims']:,}\n"
+    ]
+    
+    # Top readmission diagnoses
+    parts.append(f"\n**Top 5 Diagnosis Codes by Readmission Rate:**\n")
+    parts.extend(
+        f"• {diagnosis}: {rate*100:.1f}%\n" for diagnosis, rate in aggregates['readmission_by_diagnosis'].items()
+    )
+    
+    return ''.join(parts)
+
+def answer_patient_query(query_lower, data):
+    """Answer patient demographics queries."""
+    aggregates = data['aggregates']
+    avg_age = aggregates['avg_age']
+    # No patients means no distribution rows, so the factor is never applied
+    pct = 100.0 / aggregates['total_patients'] if aggregates['total_patients'] else 0.0
+    
+    parts = [
+        f"**Patient Demographics:**\n\n",
+        f"• Total Patients: {aggregates['total_patients']:,}\n",
+        f"• Average Age: {avg_age:.1f} years\n",
+        f"• Gender Distribution:\n"
+    ]
+    parts.extend(
+        f"  - {gender}: {count:,} ({count * pct:.1f}%)\n" for gender, count in aggregates['gender_dist'].items()
+    )
+    parts.append(f"• Age Categories:\n")
+    parts.extend(
+        f"  - {category}: {count:,} ({count * pct:.1f}%)\n" for category, count in aggregates['age_categories'].items()
+    )
+    
+    return ''.join(parts)
+
+def answer_hospital_query(query_lower, data):
+    """Answer hospital performance queries."""
+    hospital_perf = data['aggregates']['hospital_perf']
+    
+    parts = [f"**Top 10 Hospitals by Revenue:**\n\n"]
+    rows = zip(
+        hospital_perf['hospital_name'].to_numpy(),
+        hospital_perf['state'].to_numpy(),
+        hospital_perf['total_revenue'].to_numpy()
+    )
+    parts.extend(
+        f"{i}. {name} ({state}): ${revenue:,.2f}\n" for i, (name, state, revenue) in enumerate(rows, 1)
+    )
+    
+    return ''.join(parts)
+
+def answer_medication_query(query_lower, data):
+    """Answer medication and adherence queries."""
+    aggregates = data['aggregates']
+    if 'adherence' in query_lower:
+        avg_adherence = aggregates['avg_adherence'] * 100
         
-        response = f"**Top 10 Hospitals by Revenue:**\n\n"
-        for i, row in hospital_perf.iterrows():
-            response += f"{i+1}. {row['hospital_name']} ({row['state']}): ${row['total_revenue']:,.2f}\n"
+        parts = [
+            f"**Medication Adherence Analysis:**\n\n",
+            f"• Average Adherence Rate: {avg_adherence:.1f}%\n",
+            f"• Total Prescriptions: {aggregates['total_prescriptions']:,}\n"
+        ]
         
-        return response
-    
-    # Medication queries
-    elif any(word in query_lower for word in ['medication', 'prescription', 'drug', 'adherence']):
-        if 'adherence' in query_lower:
-            # Calculate adherence rate
-            prescriptions_df = data['prescriptions'].copy()
-            prescriptions_df['adherence_rate'] = prescriptions_df['days_supplied'] / prescriptions_df['days_prescribed']
-            prescriptions_df['adherence_rate'] = prescriptions_df['adherence_rate'].clip(0, 1)
-            avg_adherence = prescriptions_df['adherence_rate'].mean() * 100
-            
-            response = f"**Medication Adherence Analysis:**\n\n"
-            response += f"• Average Adherence Rate: {avg_adherence:.1f}%\n"
-            response += f"• Total Prescriptions: {len(prescriptions_df):,}\n"
-            
-            # Top medications by adherence
-            med_adherence = prescriptions_df.groupby('medication_name')['adherence_rate'].mean().sort_values(ascending=False).head(5)
-            response += f"\n**Top 5 Medications by Adherence:**\n"
-            for med, rate in med_adherence.items():
-                response += f"• {med}: {rate*100:.1f}%\n"
-            
-            return response
-        else:
-            top_meds = data['prescriptions']['medication_name'].value_counts().head(10)
-            response = f"**Top 10 Most Prescribed Medications:**\n\n"
-            for i, (med, count) in enumerate(top_meds.items(), 1):
-                response += f"{i}. {med}: {count:,} prescriptions\n"
-            return response
-    
-    # General statistics
-    elif any(word in query_lower for word in ['summary', 'overview', 'statistics', 'stats']):
-        response = f"**Healthcare Data Summary:**\n\n"
-        response += f"• **Patients**: {len(data['patients']):,}\n"
-        response += f"• **Claims**: {len(data['claims']):,}\n"
-        response += f"• **Providers**: {len(data['providers']):,}\n"
-        response += f"• **Prescriptions**: {len(data['prescriptions']):,}\n"
-        response += f"• **Total Cost**: ${data['claims']['cost'].sum():,.2f}\n"
-        response += f"• **Average Cost per Claim**: ${data['claims']['cost'].mean():,.2f}\n"
-        response += f"• **Readmission Rate**: {data['claims']['readmission_flag'].mean()*100:.1f}%\n"
-        response += f"• **Average Length of Stay**: {data['claims']['length_of_stay'].mean():.1f} days\n"
+        # Top medications by adherence
+        parts.append(f"\n**Top 5 Medications by Adherence:**\n")
+        parts.extend(f"• {med}: {rate*100:.1f}%\n" for med, rate in aggregates['med_adherence'].items())
         
-        return response
+        return ''.join(parts)
+    else:
+        parts = [f"**Top 10 Most Prescribed Medications:**\n\n"]
+        parts.extend(
+            f"{i}. {med}: {count:,} prescriptions\n"
+            for i, (med, count) in enumerate(aggregates['top_meds'].items(), 1)
+        )
+        return ''.join(parts)
+
+def answer_summary_query(query_lower, data):
+    """Answer general statistics queries."""
+    aggregates = data['aggregates']
+    parts = [
+        f"**Healthcare Data Summary:**\n\n",
+        f"• **Patients**: {aggregates['total_patients']:,}\n",
+        f"• **Claims**: {aggregates['total_claims']:,}\n",
+        f"• **Providers**: {aggregates['total_providers']:,}\n",
+        f"• **Prescriptions**: {aggregates['total_prescriptions']:,}\n",
+        f"• **Total Cost**: ${aggregates['total_cost']:,.2f}\n",
+        f"• **Average Cost per Claim**: ${aggregates['avg_cost']:,.2f}\n",
+        f"• **Readmission Rate**: {aggregates['readmission_rate']*100:.1f}%\n",
+        f"• **Average Length of Stay**: {aggregates['avg_los']:.1f} days\n"
+    ]
+    
+    return ''.join(parts)
+
+# Query routing, checked in priority order; each keyword pattern is a single compiled regex scan
+QUERY_ROUTES = [
+    (re.compile(r'cost|expensive|revenue|money'), answer_cost_query),
+    (re.compile(r'readmission|readmit|return'), answer_readmission_query),
+    (re.compile(r'patient|demographic|age|gender'), answer_patient_query),
+    (re.compile(r'hospital|provider|facility'), answer_hospital_query),
+    (re.compile(r'medication|prescription|drug|adherence'), answer_medication_query),
+    (re.compile(r'summary|overview|statistics|stats'), answer_summary_query)
+]
+
+def analyze_query(query, data):
+    """Analyze user query and provide response."""
+    query_lower = query.lower()
+    
+    for pattern, answer in QUERY_ROUTES:
+        if pattern.search(query_lower):
+            return answer(query_lower, data)
     
     # Default response
-    else:
-        return f"I can help you analyze healthcare data! Try asking about:\n\n• **Costs**: 'What are the top cost drivers?'\n• **Readmissions**: 'Show me readmission rates by diagnosis'\n• **Patients**: 'What are the patient demographics?'\n• **Hospitals**: 'Which hospitals have the highest revenue?'\n• **Medications**: 'What are the medication adherence rates?'\n• **Summary**: 'Give me a data overview'"
+    return f"I can help you analyze healthcare data! Try asking about:\n\n• **Costs**: 'What are the top cost drivers?'\n• **Readmissions**: 'Show me readmission rates by diagnosis'\n• **Patients**: 'What are the patient demographics?'\n• **Hospitals**: 'Which hospitals have the highest revenue?'\n• **Medications**: 'What are the medication adherence rates?'\n• **Summary**: 'Give me a data overview'"
 
 def main():
     """Main chatbot function."""
@@ -5,11 +5,13 @@ Works without database connection using sample data.
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
 
+from _data import get_data, get_data_version
+
 # Page configuration
 st.set_page_config(
     page_title="Healthcare Analytics Dashboard",
@@ -36,84 +38,97 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+@st.cache_data(persist='disk', show_spinner=False, max_entries=1)
+def build_sample_aggregates(data_version):
+    """Build the dashboard aggregates from the shared silver layer frames."""
+    # Shared silver layer frames; claims are grouped in Arrow
+    sample_data = get_data(data_version)
+    patients_df = sample_data['patients']
+    providers_df = sample_data['providers']
+    claims = pa.Table.from_pandas(sample_data['claims'], preserve_index=False)
+    
+    # Create summary statistics
+    summary_data = [
+        {'metric': 'Total Patients', 'value': str(len(patients_df))},
+        {'metric': 'Total Claims', 'value': str(claims.num_rows)},
+        {'metric': 'Total Providers', 'value': str(len(providers_df))},
+        {'metric': 'Total Cost', 'value': f'${pc.sum(claims["cost"]).as_py():,.2f}'}
+    ]
+    summary_df = pd.DataFrame(summary_data)
+    
+    # Top cost drivers (grouped in Arrow, converted to pandas at the boundary)
+    cost_drivers = claims.group_by('diagnosis_code').aggregate([
+        ('cost', 'sum'), ('cost', 'mean'), ('cost', 'count'), ('readmission_flag', 'mean')
+    ]).select([
+        'diagnosis_code', 'cost_sum', 'cost_mean', 'cost_count', 'readmission_flag_mean'
+    ]).rename_columns([
+        'diagnosis_code', 'total_cost', 'avg_cost_per_claim', 'claim_count', 'readmission_rate'
+    ]).to_pandas().round(2)
+    cost_drivers['description'] = 'Sample Diagnosis'
+    cost_drivers = cost_drivers.nlargest(10, 'total_cost')
+    
+    # Hospital performance (aggregate, join providers and take the top 15 in Arrow)
+    providers = pa.Table.from_pandas(providers_df[['provider_id', 'hospital_name', 'state']], preserve_index=False)
+    hospital_perf = claims.group_by('provider_id').aggregate([
+        ('cost', 'sum'), ('cost', 'mean'), ('claim_id', 'count'), ('readmission_flag', 'mean')
+    ]).select([
+        'provider_id', 'cost_sum', 'cost_mean', 'claim_id_count', 'readmission_flag_mean'
+    ]).rename_columns([
+        'provider_id', 'total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct'
+    ])
+    # Join on plain keys rather than the categorical provider codes
+    hospital_perf = hospital_perf.set_column(
+        0, 'provider_id', hospital_perf['provider_id'].cast(providers.schema.field('provider_id').type)
+    )
+    hospital_perf = hospital_perf.join(providers, 'provider_id').sort_by([
+        ('total_revenue', 'descending')
+    ]).slice(0, 15).to_pandas().round(2)
+    
+    # Monthly trends (year/month are derived once in the silver layer)
+    monthly_trends = claims.group_by(['admission_year', 'admission_month']).aggregate([
+        ('claim_id', 'count'), ('cost', 'sum'), ('cost', 'mean'), ('length_of_stay', 'mean')
+    ]).select([
+        'admission_year', 'admission_month', 'claim_id_count', 'cost_sum', 'cost_mean', 'length_of_stay_mean'
+    ]).rename_columns([
+        'admission_year', 'admission_month', 'claim_count', 'total_cost', 'avg_cost_per_claim', 'avg_length_of_stay'
+    ]).to_pandas().round(2)
+    monthly_trends = monthly_trends.sort_values(['admission_year', 'admission_month']).reset_index(drop=True)
+    
+    # Patient demographics
+    # Counted over the flattened categorical code grid, keeping only observed combinations
+    demo_keys = ['age_category', 'gender', 'insurance_type']
+    grid_shape = tuple(len(patients_df[key].cat.categories) for key in demo_keys)
+    key_codes = np.stack([patients_df[key].cat.codes.to_numpy() for key in demo_keys])
+    has_keys = (key_codes >= 0).all(axis=0)
+    cells = np.ravel_multi_index(tuple(key_codes[:, has_keys]), grid_shape)
+    patient_count = np.bincount(cells, minlength=np.prod(grid_shape))
+    chronic_sum = np.bincount(cells, weights=patients_df['chronic_conditions'].to_numpy()[has_keys], minlength=np.prod(grid_shape))
+    observed = np.flatnonzero(patient_count)
+    patient_demo = pd.DataFrame({
+        key: pd.Categorical.from_codes(codes, dtype=patients_df[key].dtype)
+        for key, codes in zip(demo_keys, np.unravel_index(observed, grid_shape))
+    })
+    patient_demo['patient_count'] = patient_count[observed]
+    patient_demo['avg_chronic_conditions'] = (chronic_sum[observed] / patient_count[observed]).round(2)
+    
+    # Readmission analysis
+    readmission_analysis = hospital_perf[hospital_perf['total_claims'] >= 10].assign(
+        readmissions=lambda df: (df['total_claims'] * df['readmission_rate_pct']).round(0).astype('int32')
+    ).nlargest(15, 'readmission_rate_pct')
+    
+    return {
+        'summary': summary_df,
+        'cost_drivers': cost_drivers,
+        'hospital_performance': hospital_perf,
+        'monthly_trends': monthly_trends,
+        'patient_demographics': patient_demo,
+        'readmission_analysis': readmission_analysis
+    }
+
 def load_sample_data():
     """Load sample data from parquet files."""
     try:
-        # Load data from silver layer files
-        claims_df = pd.read_parquet('data/silver/claims_clean.parquet')
-        patients_df = pd.read_parquet('data/silver/patients_clean.parquet')
-        providers_df = pd.read_parquet('data/silver/providers_clean.parquet')
-        prescriptions_df = pd.read_parquet('data/silver/prescriptions_clean.parquet')
-        
-        # Create summary statistics
-        summary_data = [
-            {'metric': 'Total Patients', 'value': str(len(patients_df))},
-            {'metric': 'Total Claims', 'value': str(len(claims_df))},
-            {'metric': 'Total Providers', 'value': str(len(providers_df))},
-            {'metric': 'Total Cost', 'value': f'${claims_df["cost"].sum():,.2f}'}
-        ]
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Top cost drivers
-        cost_drivers = claims_df.groupby('diagnosis_code').agg({
-            'cost': ['sum', 'mean', 'count'],
-            'readmission_flag': 'mean'
-        }).round(2)
-        cost_drivers.columns = ['total_cost', 'avg_cost_per_claim', 'claim_count', 'readmission_rate']
-        cost_drivers = cost_drivers.reset_index()
-        cost_drivers['description'] = 'Sample Diagnosis'
-        cost_drivers = cost_drivers.sort_values('total_cost', ascending=False).head(10)
-        
-        # Hospital performance
-        hospital_perf = claims_df.groupby('provider_id').agg({
-            'cost': ['sum', 'mean'],
-            'claim_id': 'count',
-            'readmission_flag': 'mean'
-        }).round(2)
-        hospital_perf.columns = ['total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct']
-        hospital_perf = hospital_perf.reset_index()
-        hospital_perf = hospital_perf.merge(providers_df[['provider_id', 'hospital_name', 'state']], on='provider_id')
-        hospital_perf = hospital_perf.sort_values('total_revenue', ascending=False).head(15)
-        
-        # Monthly trends
-        claims_copy = claims_df.copy()
-        claims_copy['admission_date_parsed'] = pd.to_datetime(claims_copy['admission_date'])
-        monthly_trends = claims_copy.groupby([
-            claims_copy['admission_date_parsed'].dt.year,
-            claims_copy['admission_date_parsed'].dt.month
-        ]).agg({
-            'claim_id': 'count',
-            'cost': ['sum', 'mean'],
-            'length_of_stay': 'mean'
-        }).round(2)
-        monthly_trends.columns = ['claim_count', 'total_cost', 'avg_cost_per_claim', 'avg_length_of_stay']
-        monthly_trends = monthly_trends.reset_index()
-        monthly_trends.columns = ['admission_year', 'admission_month', 'claim_count', 'total_cost', 'avg_cost_per_claim', 'avg_length_of_stay']
-        
-        # Patient demographics
-        patient_demo = patients_df.groupby(['age_category', 'gender', 'insurance_type']).agg({
-            'patient_id': 'count',
-            'chronic_conditions': 'mean'
-        }).round(2)
-        patient_demo.columns = ['patient_count', 'avg_chronic_conditions']
-        patient_demo = patient_demo.reset_index()
-        
-        # Readmission analysis
-        readmission_analysis = hospital_perf.copy()
-        readmission_analysis['readmissions'] = (readmission_analysis['total_claims'] * readmission_analysis['readmission_rate_pct']).round(0)
-        readmission_analysis = readmission_analysis[readmission_analysis['total_claims'] >= 10]
-        readmission_analysis = readmission_analysis.sort_values('readmission_rate_pct', ascending=False).head(15)
-        
-        return {
-            'summary': summary_df,
-            'cost_drivers': cost_drivers,
-            'hospital_performance': hospital_perf,
-            'monthly_trends': monthly_trends,
-            'patient_demographics': patient_demo,
-            'readmission_analysis': readmission_analysis
-        }
-        
+        return build_sample_aggregates(get_data_version())
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -123,13 +138,14 @@ def create_kpi_cards(data):
     if not data:
         return
     
-    summary = data['summary']
+    # Build the metric lookup once instead of masking the frame per card
+    summary = dict(zip(data['summary']['metric'].tolist(), data['summary']['value'].tolist()))
     
     # Create columns for KPI cards
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        patients = summary[summary['metric'] == 'Total Patients']['value'].iloc[0]
+        patients = summary['Total Patients']
         st.metric(
             label="Total Patients",
             value=patients,
@@ -137,7 +153,7 @@ def create_kpi_cards(data):
         )
     
     with col2:
-        claims = summary[summary['metric'] == 'Total Claims']['value'].iloc[0]
+        claims = summary['Total Claims']
         st.metric(
             label="Total Claims",
             value=claims,
@@ -145,7 +161,7 @@ def create_kpi_cards(data):
         )
     
     with col3:
-        providers = summary[summary['metric'] == 'Total Providers']['value'].iloc[0]
+        providers = summary['Total Providers']
         st.metric(
             label="Total Providers",
             value=providers,
@@ -153,7 +169,7 @@ def create_kpi_cards(data):
         )
     
     with col4:
-        total_cost = summary[summary['metric'] == 'Total Cost']['value'].iloc[0]
+        total_cost = summary['Total Cost']
         st.metric(
             label="Total Healthcare Cost",
             value=total_cost,
@@ -162,6 +178,9 @@ def create_kpi_cards(data):
 
 def create_cost_analysis_charts(data):
     """Create cost analysis charts."""
+    # Plotly is imported on first use so it does not delay the first paint
+    import plotly.express as px
+    
     if not data or data['cost_drivers'].empty:
         return
     
@@ -199,6 +218,8 @@ def create_cost_analysis_charts(data):
 
 def create_hospital_performance_charts(data):
     """Create hospital performance charts."""
+    import plotly.express as px
+    
     if not data or data['hospital_performance'].empty:
         return
     
@@ -5,11 +5,22 @@ Fully functional dashboard that works with sample data.
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import os
+import sys
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from aggregate import GOLD_INPUT_TABLES, SILVER_DTYPES, is_gold_current
+from _data import get_data_version
+
 # Page configuration
 st.set_page_config(
     page_title="Healthcare Analytics Dashboard",
@@ -36,223 +47,365 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_healthcare_data():
-    """Load healthcare data from parquet files."""
-    try:
-        # Load all data files
-        claims_df = pd.read_parquet('data/silver/claims_clean.parquet')
-        patients_df = pd.read_parquet('data/silver/patients_clean.parquet')
-        providers_df = pd.read_parquet('data/silver/providers_clean.parquet')
-        prescriptions_df = pd.read_parquet('data/silver/prescriptions_clean.parquet')
-        
-        return {
-            'claims': claims_df,
-            'patients': patients_df,
-            'providers': providers_df,
-            'prescriptions': prescriptions_df
+# Silver layer columns used by the dashboard
+SILVER_COLUMNS = {
+    'claims': ['claim_id', 'provider_id', 'diagnosis_code', 'cost', 'readmission_flag', 'length_of_stay'],
+    'patients': ['patient_id', 'age_category', 'gender'],
+    'providers': ['provider_id', 'hospital_name', 'state']
+}
+
+# Group key columns, dictionary encoded so grouping hashes integer indices
+DICTIONARY_COLUMNS = ['diagnosis_code', 'age_category', 'gender']
+
+def read_silver_table(table_name):
+    """Read the dashboard columns of a silver layer table with compact Arrow types."""
+    table = pq.read_table(f'data/silver/{table_name}_clean.parquet', columns=SILVER_COLUMNS[table_name])
+    table = table.cast(pa.schema([
+        field.with_type(SILVER_DTYPES.get(field.name, field.type)) for field in table.schema
+    ]))
+    for column in DICTIONARY_COLUMNS:
+        # Columns stored as categoricals are already dictionary encoded
+        if column in table.column_names and not pa.types.is_dictionary(table.schema.field(column).type):
+            table = table.set_column(
+                table.schema.get_field_index(column), column, pc.dictionary_encode(table[column])
+            )
+    return table
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_healthcare_data(data_version):
+    """Load the silver layer tables as Arrow tables.
+
+    The tables are shared by every session without copying, so callers must treat them as read-only.
+    Read errors propagate instead of returning None, so a failed load is never cached.
+    """
+    # Read the independent files concurrently (pyarrow releases the GIL while decoding)
+    with ThreadPoolExecutor(max_workers=len(SILVER_COLUMNS)) as executor:
+        futures = {
+            table_name: executor.submit(read_silver_table, table_name)
+            for table_name in SILVER_COLUMNS
         }
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
+        return {table_name: future.result() for table_name, future in futures.items()}
+
+def read_gold_table(table_name):
+    """Read a pre-aggregated gold layer table, or None if it is missing or older than the silver layer."""
+    gold_file = f'data/gold/{table_name}.parquet'
+    if not is_gold_current([gold_file], 'data/silver'):
         return None
+    return pd.read_parquet(gold_file)
+
+@st.cache_data(persist='disk', max_entries=1)
+def load_claims_kpis(data_version):
+    """Load the headline KPIs from the gold layer, falling back to the silver layer."""
+    gold = read_gold_table('claims_kpis')
+    if gold is not None:
+        return gold.to_dict('records')[0]
+    
+    data = load_healthcare_data(data_version)
+    # One sum per claims column; the means divide those sums by the claim count
+    # (transform guarantees the columns have no nulls)
+    claims = data['claims']
+    total_claims = claims.num_rows
+    total_cost, total_length_of_stay, total_readmissions = (
+        pc.sum(claims[column], min_count=0).as_py()
+        for column in ['cost', 'length_of_stay', 'readmission_flag']
+    )
+    return {
+        'total_patients': data['patients'].num_rows,
+        'total_claims': total_claims,
+        'total_providers': data['providers'].num_rows,
+        'total_cost': total_cost,
+        'avg_cost_per_claim': total_cost / total_claims if total_claims else None,
+        'avg_length_of_stay': total_length_of_stay / total_claims if total_claims else None,
+        'total_readmissions': total_readmissions,
+        'readmission_rate': total_readmissions / total_claims if total_claims else None
+    }
+
+def scan_silver_table(table_name, columns, data_version):
+    """Select the given columns of a shared silver layer table (zero-copy)."""
+    return load_healthcare_data(data_version)[table_name].select(columns)
+
+@st.cache_data(max_entries=1)
+def query_cost_by_diagnosis(data_version):
+    """Aggregate the top 10 diagnoses by total cost from the gold layer or the shared claims table."""
+    gold = read_gold_table('cost_drivers')
+    if gold is not None:
+        return gold[['diagnosis_code', 'total_cost', 'avg_cost_per_claim', 'claim_count']].rename(columns={
+            'avg_cost_per_claim': 'avg_cost'
+        })
+    
+    claims = scan_silver_table('claims', ['diagnosis_code', 'cost'], data_version)
+    cost_by_diagnosis = claims.group_by('diagnosis_code').aggregate([
+        ('cost', 'sum'), ('cost', 'mean'), ('cost', 'count')
+    ]).select([
+        'diagnosis_code', 'cost_sum', 'cost_mean', 'cost_count'
+    ]).rename_columns([
+        'diagnosis_code', 'total_cost', 'avg_cost', 'claim_count'
+    ]).sort_by([('total_cost', 'descending')]).slice(0, 10)
+    return cost_by_diagnosis.to_pandas().round(2)
+
+@st.cache_data(max_entries=1)
+def query_hospital_perf(data_version):
+    """Aggregate claims per hospital from the gold layer or the shared silver tables (used by the hospital and readmission charts)."""
+    gold = read_gold_table('provider_performance')
+    if gold is not None:
+        return gold
+    
+    claims = scan_silver_table('claims', ['provider_id', 'cost', 'claim_id', 'readmission_flag'], data_version)
+    providers = scan_silver_table('providers', ['provider_id', 'hospital_name', 'state'], data_version)
+    hospital_perf = claims.group_by('provider_id').aggregate([
+        ('cost', 'sum'), ('cost', 'mean'), ('claim_id', 'count'), ('readmission_flag', 'sum')
+    ])
+    # Readmission rate from the integer flag sum and the claim count
+    readmission_rate = pc.divide(
+        pc.cast(hospital_perf['readmission_flag_sum'], pa.float64()), hospital_perf['claim_id_count']
+    )
+    hospital_perf = hospital_perf.append_column('readmission_rate_pct', readmission_rate).select([
+        'provider_id', 'cost_sum', 'cost_mean', 'claim_id_count', 'readmission_rate_pct'
+    ]).rename_columns([
+        'provider_id', 'total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct'
+    ])
+    return hospital_perf.join(providers, 'provider_id').to_pandas()
 
-def create_summary_metrics(data):
+# Patient columns shown as distributions on the demographics tab
+DISTRIBUTION_COLUMNS = ['age_category', 'gender']
+
+@st.cache_data(max_entries=1)
+def query_patient_distributions(data_version):
+    """Count patients per value of each distribution column, largest first, from a single patients scan."""
+    distributions = {column: read_gold_table(f'{column}_distribution') for column in DISTRIBUTION_COLUMNS}
+    missing = [column for column, gold in distributions.items() if gold is None]
+    if not missing:
+        return distributions
+    
+    patients = scan_silver_table('patients', missing, data_version)
+    for column in missing:
+        counts = pc.value_counts(patients[column].combine_chunks())
+        distributions[column] = pa.table({
+            column: counts.field('values'), 'count': counts.field('counts')
+        }).sort_by([('count', 'descending')]).to_pandas()
+    return distributions
+
+def create_summary_metrics(kpis):
     """Create summary KPI cards."""
-    claims_df = data['claims']
-    patients_df = data['patients']
-    providers_df = data['providers']
-    
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
             label="Total Patients",
-            value=f"{len(patients_df):,}",
+            value=f"{kpis['total_patients']:,}",
             delta=None
         )
     
     with col2:
         st.metric(
             label="Total Claims",
-            value=f"{len(claims_df):,}",
+            value=f"{kpis['total_claims']:,}",
             delta=None
         )
     
     with col3:
         st.metric(
             label="Total Providers",
-            value=f"{len(providers_df):,}",
+            value=f"{kpis['total_providers']:,}",
             delta=None
         )
     
     with col4:
-        total_cost = claims_df['cost'].sum()
+        total_cost = kpis['total_cost']
         st.metric(
             label="Total Healthcare Cost",
             value=f"${total_cost:,.0f}",
             delta=None
         )
 
-def create_cost_analysis(data):
-    """Create cost analysis charts."""
-    claims_df = data['claims']
+# Most points any chart may send to the browser; aggregate or take the top N before plotting
+MAX_POINTS = 50
+
+def check_point_count(points):
+    """Reject chart data that was not aggregated down to at most MAX_POINTS points."""
+    if len(points) > MAX_POINTS:
+        raise ValueError(f"Chart data has {len(points)} points; aggregate it to at most {MAX_POINTS} before plotting")
+
+def horizontal_bar_figure(df, x, y, title, x_title, y_title, colorscale):
+    """Build a horizontal bar chart colored by its value column."""
+    check_point_count(df)
+    values = df[x].to_numpy()
+    return go.Figure(
+        go.Bar(
+            x=values,
+            y=df[y].to_numpy(),
+            orientation='h',
+            marker=dict(color=values, colorscale=colorscale, colorbar=dict(title=x_title))
+        ),
+        layout=dict(title=title, height=500, xaxis_title=x_title, yaxis_title=y_title)
+    )
+
+def bubble_scatter_figure(x, y, size, title, x_title, y_title, **trace_kwargs):
+    """Build a WebGL scatter chart with marker areas proportional to the size column."""
+    check_point_count(x)
+    return go.Figure(
+        go.Scattergl(
+            x=x,
+            y=y,
+            mode='markers',
+            marker=dict(size=size, sizemode='area', sizeref=2.0 * size.max() / 20 ** 2),
+            **trace_kwargs
+        ),
+        layout=dict(title=title, height=500, xaxis_title=x_title, yaxis_title=y_title)
+    )
+
+@st.cache_data(persist='disk', max_entries=1)
+def build_cost_figures(data_version):
+    """Build the cost analysis figures."""
+    # Top 10 cost drivers
+    cost_by_diagnosis = query_cost_by_diagnosis(data_version)
     
+    cost_fig = horizontal_bar_figure(
+        cost_by_diagnosis, 'total_cost', 'diagnosis_code',
+        "Top 10 Cost Drivers by Diagnosis", 'Total Cost ($)', 'Diagnosis Code', 'Blues'
+    )
+    
+    volume_fig = bubble_scatter_figure(
+        cost_by_diagnosis['claim_count'].to_numpy(),
+        cost_by_diagnosis['avg_cost'].to_numpy(),
+        cost_by_diagnosis['total_cost'].to_numpy(),
+        "Cost vs Volume Analysis", 'Number of Claims', 'Avg Cost per Claim ($)'
+    )
+    return cost_fig, volume_fig
+
+def create_cost_analysis(data_version):
+    """Create cost analysis charts."""
     st.subheader("💰 Cost Analysis")
     
-    # Top 10 cost drivers
-    cost_by_diagnosis = claims_df.groupby('diagnosis_code')['cost'].agg(['sum', 'mean', 'count']).round(2)
-    cost_by_diagnosis.columns = ['total_cost', 'avg_cost', 'claim_count']
-    cost_by_diagnosis = cost_by_diagnosis.sort_values('total_cost', ascending=False).head(10)
-    cost_by_diagnosis = cost_by_diagnosis.reset_index()
+    cost_fig, volume_fig = build_cost_figures(data_version)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(
-            cost_by_diagnosis,
-            x='total_cost',
-            y='diagnosis_code',
-            orientation='h',
-            title="Top 10 Cost Drivers by Diagnosis",
-            labels={'total_cost': 'Total Cost ($)', 'diagnosis_code': 'Diagnosis Code'},
-            color='total_cost',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cost_fig, use_container_width=True)
     
     with col2:
-        fig = px.scatter(
-            cost_by_diagnosis,
-            x='claim_count',
-            y='avg_cost',
-            size='total_cost',
-            title="Cost vs Volume Analysis",
-            labels={'claim_count': 'Number of Claims', 'avg_cost': 'Avg Cost per Claim ($)'}
+        st.plotly_chart(volume_fig, use_container_width=True)
+
+@st.cache_data(persist='disk', max_entries=1)
+def build_hospital_figures(data_version):
+    """Build the hospital performance figures."""
+    # Hospital performance analysis
+    hospital_perf = query_hospital_perf(data_version).nlargest(15, 'total_revenue').round(2)
+    
+    revenue_fig = horizontal_bar_figure(
+        hospital_perf.head(10), 'total_revenue', 'hospital_name',
+        "Top 10 Hospitals by Revenue", 'Total Revenue ($)', 'Hospital Name', 'Greens'
+    )
+    
+    readmission_fig = bubble_scatter_figure(
+        hospital_perf['total_claims'].to_numpy(),
+        hospital_perf['readmission_rate_pct'].to_numpy(),
+        hospital_perf['total_revenue'].to_numpy(),
+        "Readmission Rate vs Volume", 'Total Claims', 'Readmission Rate (%)',
+        customdata=hospital_perf[['hospital_name', 'state', 'avg_cost_per_claim']].to_numpy(),
+        hovertemplate=(
+            'Total Claims=%{x}<br>Readmission Rate (%)=%{y}<br>hospital_name=%{customdata[0]}'
+            '<br>state=%{customdata[1]}<br>avg_cost_per_claim=%{customdata[2]}<extra></extra>'
         )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+    )
+    return revenue_fig, readmission_fig
 
-def create_hospital_performance(data):
+def create_hospital_performance(data_version):
     """Create hospital performance charts."""
-    claims_df = data['claims']
-    providers_df = data['providers']
-    
     st.subheader("🏥 Hospital Performance")
     
-    # Hospital performance analysis
-    hospital_perf = claims_df.groupby('provider_id').agg({
-        'cost': ['sum', 'mean'],
-        'claim_id': 'count',
-        'readmission_flag': 'mean'
-    }).round(2)
-    hospital_perf.columns = ['total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct']
-    hospital_perf = hospital_perf.reset_index()
-    hospital_perf = hospital_perf.merge(providers_df[['provider_id', 'hospital_name', 'state']], on='provider_id')
-    hospital_perf = hospital_perf.sort_values('total_revenue', ascending=False).head(15)
+    revenue_fig, readmission_fig = build_hospital_figures(data_version)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(
-            hospital_perf.head(10),
-            x='total_revenue',
-            y='hospital_name',
-            orientation='h',
-            title="Top 10 Hospitals by Revenue",
-            labels={'total_revenue': 'Total Revenue ($)', 'hospital_name': 'Hospital Name'},
-            color='total_revenue',
-            color_continuous_scale='Greens'
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(revenue_fig, use_container_width=True)
     
     with col2:
-        fig = px.scatter(
-            hospital_perf,
-            x='total_claims',
-            y='readmission_rate_pct',
-            size='total_revenue',
-            hover_data=['hospital_name', 'state', 'avg_cost_per_claim'],
-            title="Readmission Rate vs Volume",
-            labels={'total_claims': 'Total Claims', 'readmission_rate_pct': 'Readmission Rate (%)'}
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(readmission_fig, use_container_width=True)
 
-def create_patient_demographics(data):
-    """Create patient demographics charts."""
-    patients_df = data['patients']
+@st.cache_data(persist='disk', max_entries=1)
+def build_demographics_figures(data_version):
+    """Build the patient demographics figures."""
+    distributions = query_patient_distributions(data_version)
+    
+    # Age distribution
+    age_dist = distributions['age_category']
+    check_point_count(age_dist)
+    age_fig = go.Figure(
+        go.Pie(values=age_dist['count'].to_numpy(), labels=age_dist['age_category'].to_numpy()),
+        layout=dict(title="Patient Distribution by Age Category")
+    )
     
+    # Gender distribution
+    gender_dist = distributions['gender']
+    check_point_count(gender_dist)
+    gender_fig = go.Figure(
+        go.Bar(x=gender_dist['gender'].to_numpy(), y=gender_dist['count'].to_numpy()),
+        layout=dict(title="Patient Distribution by Gender", xaxis_title='Gender', yaxis_title='Number of Patients')
+    )
+    return age_fig, gender_fig
+
+def create_patient_demographics(data_version):
+    """Create patient demographics charts."""
     st.subheader("👥 Patient Demographics")
     
+    age_fig, gender_fig = build_demographics_figures(data_version)
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        # Age distribution
-        age_dist = patients_df['age_category'].value_counts()
-        fig = px.pie(
-            values=age_dist.values,
-            names=age_dist.index,
-            title="Patient Distribution by Age Category"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(age_fig, use_container_width=True)
     
     with col2:
-        # Gender distribution
-        gender_dist = patients_df['gender'].value_counts()
-        fig = px.bar(
-            x=gender_dist.index,
-            y=gender_dist.values,
-            title="Patient Distribution by Gender",
-            labels={'x': 'Gender', 'y': 'Number of Patients'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(gender_fig, use_container_width=True)
 
-def create_readmission_analysis(data):
-    """Create readmission analysis charts."""
-    claims_df = data['claims']
-    providers_df = data['providers']
+@st.cache_data(persist='disk', max_entries=1)
+def build_readmission_figure(data_version):
+    """Build the readmission analysis figure."""
+    # Readmission analysis
+    hospital_perf = query_hospital_perf(data_version)
+    hospital_perf = hospital_perf[hospital_perf['total_claims'] >= 10].nlargest(15, 'readmission_rate_pct').round(2)
     
+    return horizontal_bar_figure(
+        hospital_perf.head(10), 'readmission_rate_pct', 'hospital_name',
+        "Top 10 Hospitals by Readmission Rate", 'Readmission Rate (%)', 'Hospital Name', 'Reds'
+    )
+
+def create_readmission_analysis(kpis, data_version):
+    """Create readmission analysis charts."""
     st.subheader("🔄 Readmission Analysis")
     
-    # Readmission analysis
-    hospital_perf = claims_df.groupby('provider_id').agg({
-        'cost': ['sum', 'mean'],
-        'claim_id': 'count',
-        'readmission_flag': 'mean'
-    }).round(2)
-    hospital_perf.columns = ['total_revenue', 'avg_cost_per_claim', 'total_claims', 'readmission_rate_pct']
-    hospital_perf = hospital_perf.reset_index()
-    hospital_perf = hospital_perf.merge(providers_df[['provider_id', 'hospital_name', 'state']], on='provider_id')
-    hospital_perf = hospital_perf[hospital_perf['total_claims'] >= 10]
-    hospital_perf = hospital_perf.sort_values('readmission_rate_pct', ascending=False).head(15)
+    fig = build_readmission_figure(data_version)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig = px.bar(
-            hospital_perf.head(10),
-            x='readmission_rate_pct',
-            y='hospital_name',
-            orientation='h',
-            title="Top 10 Hospitals by Readmission Rate",
-            labels={'readmission_rate_pct': 'Readmission Rate (%)', 'hospital_name': 'Hospital Name'},
-            color='readmission_rate_pct',
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(height=500)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Overall readmission statistics
-        overall_readmission_rate = claims_df['readmission_flag'].mean() * 100
-        total_readmissions = claims_df['readmission_flag'].sum()
+        overall_readmission_rate = kpis['readmission_rate'] * 100
+        total_readmissions = kpis['total_readmissions']
         
         st.metric("Overall Readmission Rate", f"{overall_readmission_rate:.1f}%")
         st.metric("Total Readmissions", f"{total_readmissions:,}")
-        st.metric("Average Cost per Claim", f"${claims_df['cost'].mean():,.2f}")
-        st.metric("Average Length of Stay", f"{claims_df['length_of_stay'].mean():.1f} days")
+        st.metric("Average Cost per Claim", f"${kpis['avg_cost_per_claim']:,.2f}")
+        st.metric("Average Length of Stay", f"{kpis['avg_length_of_stay']:.1f} days")
+
+# Footer HTML with a slot for the last updated timestamp
+FOOTER_TEMPLATE = """
+<div style='text-align: center; color: #666; padding: 2rem;'>
+    <p>Healthcare Analytics Dashboard | Powered by Streamlit & Sample Data</p>
+    <p>Last updated: {}</p>
+</div>
+"""
+
+@st.cache_data(ttl=60, show_spinner=False)
+def render_footer():
+    """Render the footer HTML, refreshing its timestamp at most once a minute."""
+    return FOOTER_TEMPLATE.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
 def main():
     """Main dashboard function."""
@@ -260,10 +413,16 @@ def main():
     st.markdown('<h1 class="main-header">🏥 Healthcare Analytics Dashboard</h1>', unsafe_allow_html=True)
     
     # Load data
+    # Every cached loader, query and figure builder is keyed on the silver inputs and gold layer mtime
+    data_version = get_data_version(GOLD_INPUT_TABLES, include_gold=True)
     with st.spinner("Loading healthcare data..."):
-        data = load_healthcare_data()
+        try:
+            kpis = load_claims_kpis(data_version)
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            kpis = None
     
-    if not data:
+    if not kpis:
         st.error("Failed to load data. Please check your data files.")
         return
     
@@ -271,39 +430,30 @@ def main():
     st.markdown("---")
     
     # Summary Metrics
-    create_summary_metrics(data)
-    
-    st.markdown("---")
-    
-    # Cost Analysis
-    create_cost_analysis(data)
+    create_summary_metrics(kpis)
     
     st.markdown("---")
     
-    # Hospital Performance
-    create_hospital_performance(data)
+    # Analysis sections
+    tab_cost, tab_hospitals, tab_demographics, tab_readmissions = st.tabs(
+        ["Cost", "Hospitals", "Demographics", "Readmissions"]
+    )
     
-    st.markdown("---")
+    with tab_cost:
+        create_cost_analysis(data_version)
     
-    # Patient Demographics
-    create_patient_demographics(data)
+    with tab_hospitals:
+        create_hospital_performance(data_version)
     
-    st.markdown("---")
+    with tab_demographics:
+        create_patient_demographics(data_version)
     
-    # Readmission Analysis
-    create_readmission_analysis(data)
+    with tab_readmissions:
+        create_readmission_analysis(kpis, data_version)
     
     # Footer
     st.markdown("---")
-    st.markdown(
-        """
-        <div style='text-align: center; color: #666; padding: 2rem;'>
-            <p>Healthcare Analytics Dashboard | Powered by Streamlit & Sample Data</p>
-            <p>Last updated: {}</p>
-        </div>
-        """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
-        unsafe_allow_html=True
-    )
+    st.markdown(render_footer(), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()